@@ -7,23 +7,46 @@ Monitors Docker Swarm events and automatically:
 - Updates Traefik certificate configuration
 """
 
+import base64
 import docker
 import json
 import logging
 import os
+import queue
 import re
-import subprocess
 import sys
+import tempfile
+import threading
 import time
+import requests
 import yaml
 import web_catalog
-from datetime import datetime, timedelta
-from typing import List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Tuple
+
+# Prefer orjson for decoding the Docker event stream
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Prefer the libyaml bindings, falling back to the pure-Python implementation
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
 
 # Load configuration
 def load_config(config_path='/config/config.yml'):
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YamlLoader)
 
 config = load_config()
 
@@ -39,57 +62,151 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# FreeIPA client
-class FreeIPAClient:
-    def __init__(self, server, domain, username, password):
-        self.server = server
-        self.domain = domain
+def write_file_atomic(path: str, content: str, mode: int = 0o644):
+    """Write a file via a temp file and rename so readers never see a partial write"""
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f'.{os.path.basename(path)}.')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        os.chmod(tmp_file, mode)
+        os.replace(tmp_file, path)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+def ipa_value(value):
+    """Unwrap FreeIPA JSON encodings such as {"__base64__": ...} or {"__dns_name__": ...}"""
+    if isinstance(value, dict) and len(value) == 1:
+        return next(iter(value.values()))
+    return value
+
+class IPAError(Exception):
+    """Error returned by a FreeIPA JSON-RPC command"""
+    def __init__(self, name: str, message: str):
+        super().__init__(message)
+        self.name = name
+
+class IPASession:
+    """Persistent JSON-RPC session to the FreeIPA API"""
+    def __init__(self, server, username, password, ca_cert, max_connections=4, timeout=30):
+        self.base_url = f"https://{server}/ipa"
         self.username = username
         self.password = password
+        # Connect/read timeout for every request, so an unresponsive server
+        # raises instead of hanging workers (and the login lock) forever
+        self.timeout = timeout
+        self._login_lock = threading.Lock()
+        
+        # One keep-alive pool shared by all threads; pool_block caps
+        # concurrent requests at max_connections
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, pool_block=True))
+        self.http.verify = ca_cert if os.path.exists(ca_cert) else True
+        self.http.headers.update({'Referer': self.base_url})
+    
+    def login(self) -> bool:
+        """Obtain a session cookie with the configured credentials"""
+        with self._login_lock:
+            response = self.http.post(
+                f"{self.base_url}/session/login_password",
+                data={'user': self.username, 'password': self.password},
+                headers={'Accept': 'text/plain'},
+                timeout=self.timeout
+            )
+        if response.status_code != 200:
+            logger.error(f"Failed to authenticate: HTTP {response.status_code} {response.headers.get('X-IPA-Rejection-Reason', '')}")
+            return False
+        return True
+    
+    def call(self, method: str, args: Optional[list] = None, options: Optional[dict] = None) -> dict:
+        """Run one command and return its result, raising IPAError on failure"""
+        payload = {'method': method, 'params': [args or [], options or {}], 'id': 0}
+        response = self.http.post(f"{self.base_url}/session/json", json=payload, timeout=self.timeout)
+        if response.status_code == 401:
+            # Session expired; log in again and retry once
+            if not self.login():
+                raise IPAError('AuthenticationError', 'Could not re-authenticate to FreeIPA')
+            response = self.http.post(f"{self.base_url}/session/json", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        
+        data = response.json()
+        if data.get('error'):
+            raise IPAError(data['error'].get('name', ''), data['error'].get('message', ''))
+        return data['result']
+
+# FreeIPA client
+class FreeIPAClient:
+    def __init__(self, server, username, password):
         self.dns_zone = config['freeipa']['dns_zone']
         self.cert_enabled = config.get('certificates', {}).get('enabled', False)
         self.cert_path = config.get('certificates', {}).get('cert_path', '/certs/services')
         self.validity_days = config.get('certificates', {}).get('validity_days', 730)
+        # Cert-request throttling and negative cache of failed hostnames
+        self.max_requests_per_minute = config.get('certificates', {}).get('max_requests_per_minute', 30)
+        self.failure_ttl = config.get('certificates', {}).get('failure_ttl', 300)
+        self._request_times = deque()
+        self._failed_hostnames: Dict[str, float] = {}
+        
+        # All commands share one authenticated HTTPS session
+        self.rpc = IPASession(
+            server, username, password,
+            ca_cert=config['freeipa'].get('ca_cert', '/etc/ipa/ca.crt'),
+            max_connections=config['freeipa'].get('max_parallel_calls', 4),
+            timeout=config['freeipa'].get('timeout', 30)
+        )
+        # Guards the certificate caches when hostnames are processed in parallel
+        self._lock = threading.RLock()
+        
+        # Parsed certificate expiry (cert_file -> (mtime_ns, not_valid_after)),
+        # persisted so a restart doesn't re-parse every certificate
+        self.validity_cache_file = os.path.join(self.cert_path, '.validity.json')
+        self._cert_cache: Dict[str, Tuple[int, datetime]] = self._load_validity_cache()
+        # Saved once per batch by save_validity_cache(), not on every parse
+        self._validity_dirty = False
         
-    def kinit(self):
+        # Certificates published to Traefik (hostname -> (cert_file, key_file));
+        # scanned once here and then maintained by request/revoke
+        self.active_certs: Dict[str, Tuple[str, str]] = self._scan_certificates()
+        self._certs_dirty = False
+        
+    def login(self):
         """Authenticate to FreeIPA"""
         try:
-            cmd = f"echo '{self.password}' | kinit {self.username}@{self.domain.upper()}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if result.returncode == 0:
+            if self.rpc.login():
                 logger.info("Successfully authenticated to FreeIPA")
                 return True
-            else:
-                logger.error(f"Failed to authenticate: {result.stderr}")
-                return False
+            return False
         except Exception as e:
-            logger.error(f"Exception during kinit: {e}")
+            logger.error(f"Exception during login: {e}")
             return False
     
+    def start_session_refresh(self, interval: float):
+        """Re-authenticate on a timer thread so the session never lapses while idle"""
+        def refresh():
+            while True:
+                time.sleep(interval)
+                logger.debug("Refreshing FreeIPA session")
+                try:
+                    if not self.rpc.login():
+                        logger.error("Failed to refresh FreeIPA session")
+                except Exception as e:
+                    logger.error(f"Exception refreshing FreeIPA session: {e}")
+        
+        threading.Thread(target=refresh, daemon=True).start()
+    
     def add_dns_record(self, hostname: str, ip_addresses: List[str]) -> bool:
         """Add DNS A record(s) to FreeIPA"""
         try:
-            self.kinit()
-            
-            for ip in ip_addresses:
-                cmd = [
-                    'ipa', 'dnsrecord-add',
-                    self.dns_zone,
-                    hostname,
-                    '--a-rec', ip
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    logger.info(f"Added DNS record: {hostname}.{self.dns_zone} -> {ip}")
-                elif 'already exists' in result.stderr.lower():
-                    logger.warning(f"DNS record already exists: {hostname}.{self.dns_zone} -> {ip}")
-                else:
-                    logger.error(f"Failed to add DNS record: {result.stderr}")
-                    return False
-                    
+            # All A records go in a single dnsrecord_add call
+            self.rpc.call('dnsrecord_add', [self.dns_zone, hostname], {'arecord': ip_addresses})
+            logger.info(f"Added DNS record: {hostname}.{self.dns_zone} -> {', '.join(ip_addresses)}")
             return True
+        except IPAError as e:
+            if e.name in ('DuplicateEntry', 'EmptyModlist'):
+                logger.warning(f"DNS record already exists: {hostname}.{self.dns_zone} -> {', '.join(ip_addresses)}")
+                return True
+            logger.error(f"Failed to add DNS record: {e}")
+            return False
         except Exception as e:
             logger.error(f"Exception adding DNS record: {e}")
             return False
@@ -97,60 +214,84 @@ class FreeIPAClient:
     def remove_dns_record(self, hostname: str, ip_addresses: List[str]) -> bool:
         """Remove DNS A record(s) from FreeIPA"""
         try:
-            self.kinit()
-            
-            for ip in ip_addresses:
-                cmd = [
-                    'ipa', 'dnsrecord-del',
-                    self.dns_zone,
-                    hostname,
-                    '--a-rec', ip
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    logger.info(f"Removed DNS record: {hostname}.{self.dns_zone} -> {ip}")
-                elif 'not found' in result.stderr.lower():
-                    logger.warning(f"DNS record not found: {hostname}.{self.dns_zone} -> {ip}")
-                else:
-                    logger.error(f"Failed to remove DNS record: {result.stderr}")
-                    return False
-                    
+            # All A records go in a single dnsrecord_del call
+            self.rpc.call('dnsrecord_del', [self.dns_zone, hostname], {'arecord': ip_addresses})
+            logger.info(f"Removed DNS record: {hostname}.{self.dns_zone} -> {', '.join(ip_addresses)}")
             return True
+        except IPAError as e:
+            if e.name == 'NotFound':
+                logger.warning(f"DNS record not found: {hostname}.{self.dns_zone} -> {', '.join(ip_addresses)}")
+                return True
+            if e.name == 'AttrValueNotFound':
+                # FreeIPA aborts the whole delete on the first missing value;
+                # remove the remaining A records one at a time
+                return self._remove_dns_values(hostname, ip_addresses)
+            logger.error(f"Failed to remove DNS record: {e}")
+            return False
         except Exception as e:
             logger.error(f"Exception removing DNS record: {e}")
             return False
     
+    def _remove_dns_values(self, hostname: str, ip_addresses: List[str]) -> bool:
+        """Remove A records individually, skipping values that are already gone"""
+        success = True
+        for ip in ip_addresses:
+            try:
+                self.rpc.call('dnsrecord_del', [self.dns_zone, hostname], {'arecord': [ip]})
+                logger.info(f"Removed DNS record: {hostname}.{self.dns_zone} -> {ip}")
+            except IPAError as e:
+                if e.name in ('NotFound', 'AttrValueNotFound'):
+                    logger.warning(f"DNS record not found: {hostname}.{self.dns_zone} -> {ip}")
+                    continue
+                logger.error(f"Failed to remove DNS record {hostname}.{self.dns_zone} -> {ip}: {e}")
+                success = False
+            except Exception as e:
+                logger.error(f"Exception removing DNS record {hostname}.{self.dns_zone} -> {ip}: {e}")
+                success = False
+        return success
+    
+    def list_dns_records(self) -> Optional[set]:
+        """List all record names in the DNS zone with a single call"""
+        try:
+            result = self.rpc.call('dnsrecord_find', [self.dns_zone], {'pkey_only': True, 'sizelimit': 0})
+            names = set()
+            for record in result['result']:
+                for name in record.get('idnsname', []):
+                    names.add(ipa_value(name))
+            return names
+        except Exception as e:
+            logger.error(f"Exception listing DNS records: {e}")
+            return None
+    
     def ensure_service_principal(self, hostname: str) -> bool:
         """Ensure host and service principal exist in FreeIPA"""
+        fqdn = f"{hostname}.{self.dns_zone}"
         try:
-            self.kinit()
-            fqdn = f"{hostname}.{self.dns_zone}"
-            
-            # Add host (ignore if exists)
-            cmd = ['ipa', 'host-add', fqdn, '--force']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                logger.info(f"Created host: {fqdn}")
-            elif 'already exists' in result.stderr.lower():
-                logger.debug(f"Host already exists: {fqdn}")
-            else:
-                logger.warning(f"Could not create host: {result.stderr}")
-            
-            # Add service principal (ignore if exists)
-            cmd = ['ipa', 'service-add', f'HTTP/{fqdn}']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                logger.info(f"Created service principal: HTTP/{fqdn}")
-                return True
-            elif 'already exists' in result.stderr.lower():
+            # Add service principal first; the host only needs creating
+            # when FreeIPA reports it missing, so the common case is one call
+            try:
+                self.rpc.call('service_add', [f'HTTP/{fqdn}'])
+            except IPAError as e:
+                if e.name != 'NotFound':
+                    raise
+                try:
+                    self.rpc.call('host_add', [fqdn], {'force': True})
+                    logger.info(f"Created host: {fqdn}")
+                except IPAError as host_error:
+                    if host_error.name == 'DuplicateEntry':
+                        logger.debug(f"Host already exists: {fqdn}")
+                    else:
+                        logger.warning(f"Could not create host: {host_error}")
+                self.rpc.call('service_add', [f'HTTP/{fqdn}'])
+            
+            logger.info(f"Created service principal: HTTP/{fqdn}")
+            return True
+        except IPAError as e:
+            if e.name == 'DuplicateEntry':
                 logger.debug(f"Service principal already exists: HTTP/{fqdn}")
                 return True
-            else:
-                logger.error(f"Failed to create service principal: {result.stderr}")
-                return False
-                
+            logger.error(f"Failed to create service principal: {e}")
+            return False
         except Exception as e:
             logger.error(f"Exception ensuring service principal: {e}")
             return False
@@ -160,8 +301,37 @@ class FreeIPAClient:
         if not self.cert_enabled:
             return True
         
+        # Don't retry a hostname whose last request failed until the TTL passes
+        failed_at = self._failed_hostnames.get(hostname)
+        if failed_at and time.time() - failed_at < self.failure_ttl:
+            logger.warning(f"Skipping certificate request for {hostname}, last attempt failed recently")
+            return False
+        
+        success = self._request_certificate(hostname)
+        with self._lock:
+            if success:
+                self._failed_hostnames.pop(hostname, None)
+            else:
+                self._failed_hostnames[hostname] = time.time()
+        return success
+    
+    def _wait_for_request_slot(self):
+        """Block until a certificate request fits in the per-minute limit"""
+        while True:
+            with self._lock:
+                now = time.time()
+                while self._request_times and now - self._request_times[0] >= 60:
+                    self._request_times.popleft()
+                if len(self._request_times) < self.max_requests_per_minute:
+                    self._request_times.append(now)
+                    return
+                wait = 60 - (now - self._request_times[0])
+            logger.warning(f"Certificate request limit reached, waiting {wait:.0f}s")
+            time.sleep(wait)
+    
+    def _request_certificate(self, hostname: str) -> bool:
+        """Ensure principal, key and a valid certificate exist for hostname"""
         try:
-            self.kinit()
             fqdn = f"{hostname}.{self.dns_zone}"
             
             # Ensure service principal exists
@@ -171,69 +341,70 @@ class FreeIPAClient:
             
             # Certificate file paths
             key_file = f"{self.cert_path}/{hostname}.key"
-            csr_file = f"/tmp/{hostname}.csr"
             cert_file = f"{self.cert_path}/{hostname}.crt"
             
             # Check if certificate already exists and is valid
-            if os.path.exists(cert_file):
-                if self.is_certificate_valid(cert_file):
+            try:
+                cert_stat = os.stat(cert_file)
+            except FileNotFoundError:
+                cert_stat = None
+            if cert_stat:
+                if self.is_certificate_valid(cert_file, cert_stat):
                     logger.info(f"Valid certificate already exists for {hostname}")
                     return True
                 else:
                     logger.info(f"Existing certificate for {hostname} is expired or invalid, renewing...")
             
             # Generate private key if doesn't exist
-            if not os.path.exists(key_file):
-                cmd = ['openssl', 'genrsa', '-out', key_file, '2048']
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    logger.error(f"Failed to generate key: {result.stderr}")
-                    return False
-                os.chmod(key_file, 0o600)
+            try:
+                with open(key_file, 'rb') as f:
+                    key = serialization.load_pem_private_key(f.read(), password=None)
+            except FileNotFoundError:
+                key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+                # Created as 0600 so the key is never readable by others
+                fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(key.private_bytes(
+                        serialization.Encoding.PEM,
+                        serialization.PrivateFormat.PKCS8,
+                        serialization.NoEncryption()
+                    ))
                 logger.info(f"Generated private key: {key_file}")
             
             # Generate CSR
-            cmd = [
-                'openssl', 'req', '-new',
-                '-key', key_file,
-                '-out', csr_file,
-                '-subj', f'/CN={fqdn}/O=ZCloud'
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(f"Failed to generate CSR: {result.stderr}")
-                return False
+            csr = x509.CertificateSigningRequestBuilder().subject_name(x509.Name([
+                x509.NameAttribute(NameOID.COMMON_NAME, fqdn),
+                x509.NameAttribute(NameOID.ORGANIZATION_NAME, 'ZCloud'),
+            ])).sign(key, hashes.SHA256())
+            csr_pem = csr.public_bytes(serialization.Encoding.PEM).decode('ascii')
             
             # Request certificate from FreeIPA
-            cmd = ['ipa', 'cert-request', csr_file, f'--principal=HTTP/{fqdn}']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                logger.error(f"Failed to request certificate: {result.stderr}")
-                return False
-            
-            # Extract serial number from output
-            serial_match = re.search(r'Serial number: (\d+)', result.stdout)
-            if not serial_match:
-                logger.error(f"Could not find serial number in cert-request output")
-                return False
-            
-            serial = serial_match.group(1)
-            logger.info(f"Certificate requested for {hostname}, serial: {serial}")
-            
-            # Retrieve certificate
-            cmd = ['ipa', 'cert-show', serial, f'--out={cert_file}']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(f"Failed to retrieve certificate: {result.stderr}")
+            self._wait_for_request_slot()
+            try:
+                entry = self.rpc.call('cert_request', [csr_pem], {'principal': f'HTTP/{fqdn}'})['result']
+                
+                # cert_request normally returns the issued certificate; only
+                # fall back to cert_show when it doesn't
+                if 'certificate' not in entry:
+                    serial = ipa_value(entry['serial_number'])
+                    logger.info(f"Certificate requested for {hostname}, serial: {serial}")
+                    entry = self.rpc.call('cert_show', [serial])['result']
+            except IPAError as e:
+                logger.error(f"Failed to request certificate: {e}")
                 return False
             
-            os.chmod(cert_file, 0o644)
+            # Parse once, write once and seed the expiry cache from the same object
+            cert = x509.load_der_x509_certificate(base64.b64decode(ipa_value(entry['certificate'])))
+            write_file_atomic(cert_file, cert.public_bytes(serialization.Encoding.PEM).decode('ascii'))
+            with self._lock:
+                self._cert_cache[cert_file] = (os.stat(cert_file).st_mtime_ns, cert.not_valid_after_utc)
+                self._validity_dirty = True
             logger.info(f"Retrieved certificate: {cert_file}")
             
-            # Clean up CSR
-            if os.path.exists(csr_file):
-                os.remove(csr_file)
+            # Also rewrite on renewal so Traefik reloads the new certificate
+            with self._lock:
+                self.active_certs[hostname] = (cert_file, key_file)
+                self._certs_dirty = True
             
             # Update Traefik dynamic configuration
             self.update_traefik_certificates()
@@ -255,9 +426,18 @@ class FreeIPAClient:
             
             # Remove certificate files
             for file in [cert_file, key_file]:
-                if os.path.exists(file):
+                try:
                     os.remove(file)
                     logger.info(f"Removed certificate file: {file}")
+                except FileNotFoundError:
+                    pass
+            
+            with self._lock:
+                if self._cert_cache.pop(cert_file, None):
+                    self._validity_dirty = True
+                
+                if self.active_certs.pop(hostname, None):
+                    self._certs_dirty = True
             
             # Update Traefik configuration
             self.update_traefik_certificates()
@@ -268,22 +448,15 @@ class FreeIPAClient:
             logger.error(f"Exception revoking certificate: {e}")
             return False
     
-    def is_certificate_valid(self, cert_file: str) -> bool:
+    def is_certificate_valid(self, cert_file: str, cert_stat: Optional[os.stat_result] = None) -> bool:
         """Check if certificate is valid and not expiring soon"""
         try:
             # Get expiration date
-            cmd = ['openssl', 'x509', '-in', cert_file, '-noout', '-enddate']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                return False
-            
-            # Parse date
-            date_str = result.stdout.strip().replace('notAfter=', '')
-            expiry = datetime.strptime(date_str, '%b %d %H:%M:%S %Y %Z')
+            expiry = self.certificate_expiry(cert_file, cert_stat)
             
             # Check if expiring soon
             renew_threshold = config.get('certificates', {}).get('renew_threshold_days', 30)
-            threshold = datetime.now() + timedelta(days=renew_threshold)
+            threshold = datetime.now(timezone.utc) + timedelta(days=renew_threshold)
             
             if expiry < threshold:
                 logger.info(f"Certificate expires on {expiry}, renewing...")
@@ -295,25 +468,87 @@ class FreeIPAClient:
             logger.error(f"Error checking certificate validity: {e}")
             return False
     
+    def certificate_expiry(self, cert_file: str, cert_stat: Optional[os.stat_result] = None) -> datetime:
+        """Get certificate expiry, parsing the file only when it has changed"""
+        mtime_ns = (cert_stat or os.stat(cert_file)).st_mtime_ns
+        cached = self._cert_cache.get(cert_file)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        with open(cert_file, 'rb') as f:
+            cert = x509.load_pem_x509_certificate(f.read())
+        expiry = cert.not_valid_after_utc
+        
+        with self._lock:
+            self._cert_cache[cert_file] = (mtime_ns, expiry)
+            self._validity_dirty = True
+        return expiry
+    
+    def _load_validity_cache(self) -> Dict[str, Tuple[int, datetime]]:
+        """Load persisted certificate expiry cache"""
+        try:
+            with open(self.validity_cache_file, 'r') as f:
+                data = json.load(f)
+            return {
+                cert_file: (mtime_ns, datetime.fromtimestamp(expiry, timezone.utc))
+                for cert_file, (mtime_ns, expiry) in data.items()
+            }
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable certificate validity cache: {e}")
+            return {}
+    
+    def save_validity_cache(self):
+        """Persist certificate expiry cache if it changed since the last save"""
+        with self._lock:
+            if not self._validity_dirty:
+                return
+            try:
+                data = {
+                    cert_file: [mtime_ns, expiry.timestamp()]
+                    for cert_file, (mtime_ns, expiry) in self._cert_cache.items()
+                }
+                # Atomic, so a crash mid-write never leaves truncated JSON
+                write_file_atomic(self.validity_cache_file, json.dumps(data))
+                self._validity_dirty = False
+            except Exception as e:
+                logger.warning(f"Could not save certificate validity cache: {e}")
+    
+    def _scan_certificates(self) -> Dict[str, Tuple[str, str]]:
+        """Find certificate/key pairs already present in the certificate directory"""
+        try:
+            with os.scandir(self.cert_path) as it:
+                names = {entry.name for entry in it if entry.is_file()}
+        except FileNotFoundError:
+            return {}
+        
+        certs = {}
+        for name in names:
+            if name.endswith('.crt'):
+                hostname = name[:-4]  # Remove .crt
+                if f"{hostname}.key" in names:
+                    certs[hostname] = (f"{self.cert_path}/{hostname}.crt", f"{self.cert_path}/{hostname}.key")
+        return certs
+    
     def update_traefik_certificates(self):
         """Update Traefik dynamic certificate configuration"""
+        with self._lock:
+            self._write_traefik_certificates()
+    
+    def _write_traefik_certificates(self):
+        """Write Traefik configuration if the registry changed (caller holds the lock)"""
+        if not self._certs_dirty:
+            return
+        
         try:
             config_file = '/traefik-config/certificates.yml'
             
             # Build certificate list
-            certificates = []
-            if os.path.exists(self.cert_path):
-                for filename in os.listdir(self.cert_path):
-                    if filename.endswith('.crt'):
-                        hostname = filename[:-4]  # Remove .crt
-                        key_file = f"{self.cert_path}/{hostname}.key"
-                        cert_file = f"{self.cert_path}/{hostname}.crt"
-                        
-                        if os.path.exists(key_file):
-                            certificates.append({
-                                'certFile': cert_file,
-                                'keyFile': key_file
-                            })
+            certificates = [
+                {'certFile': cert_file, 'keyFile': key_file}
+                for cert_file, key_file in sorted(self.active_certs.values())
+            ]
             
             # Build configuration
             traefik_config = {
@@ -328,59 +563,221 @@ class FreeIPAClient:
                 }
             }
             
-            # Write configuration
-            with open(config_file, 'w') as f:
-                yaml.dump(traefik_config, f, default_flow_style=False)
+            # Write configuration atomically so Traefik never reads a partial file
+            write_file_atomic(config_file, yaml.dump(traefik_config, Dumper=YamlDumper, default_flow_style=False))
             
+            self._certs_dirty = False
             logger.info(f"Updated Traefik certificates configuration with {len(certificates)} certificates")
             
         except Exception as e:
             logger.error(f"Error updating Traefik configuration: {e}", exc_info=True)
 
+# Hostname extraction constants, resolved once at import
+HOST_RULE_RE = re.compile(r'Host\(`([^`]+)`\)')
+HOST_SNI_RULE_RE = re.compile(r'HostSNI\(`([^`]+)`\)')
+ZONE_SUFFIX = f'.{config["freeipa"]["dns_zone"]}'
+
 # Extract hostnames from service
 def extract_hostnames(service) -> List[str]:
     """Extract all hostnames from service labels"""
     try:
         hostnames = []
+        seen = set()
         spec = service.attrs.get('Spec', {})
         labels = spec.get('Labels', {})
 
+        def add(hostname):
+            # Avoid duplicates while keeping label order
+            if hostname not in seen:
+                seen.add(hostname)
+                hostnames.append(hostname)
+
         # Method 1: Check for explicit dns.hostname label
         if 'dns.hostname' in labels:
             hostname = labels['dns.hostname']
-            hostname = hostname.replace(f'.{config["freeipa"]["dns_zone"]}', '')
-            hostnames.append(hostname)
+            if hostname.endswith(ZONE_SUFFIX):
+                hostname = hostname[:-len(ZONE_SUFFIX)]
+            add(hostname)
 
         # Method 2: Extract from ALL Traefik router rules
         if config['swarm']['extract_from_traefik']:
             for key, value in labels.items():
-                # HTTP routers with Host() rules
-                if 'traefik.http.routers' in key and '.rule' in key:
-                    match = re.search(r'Host\(`([^`]+)`\)', value)
-                    if match:
-                        fqdn = match.group(1)
-                        if fqdn.endswith(f'.{config["freeipa"]["dns_zone"]}'):
-                            hostname = fqdn.replace(f'.{config["freeipa"]["dns_zone"]}', '')
-                            # Avoid duplicates
-                            if hostname not in hostnames:
-                                hostnames.append(hostname)
-
-                # TCP routers with HostSNI() rules
-                if 'traefik.tcp.routers' in key and '.rule' in key:
-                    match = re.search(r'HostSNI\(`([^`]+)`\)', value)
-                    if match:
-                        fqdn = match.group(1)
-                        if fqdn.endswith(f'.{config["freeipa"]["dns_zone"]}'):
-                            hostname = fqdn.replace(f'.{config["freeipa"]["dns_zone"]}', '')
-                            # Avoid duplicates
-                            if hostname not in hostnames:
-                                hostnames.append(hostname)
+                if not key.endswith('.rule'):
+                    continue
+
+                # HTTP routers with Host() rules, TCP routers with HostSNI() rules
+                if key.startswith('traefik.http.routers.'):
+                    match = HOST_RULE_RE.search(value)
+                elif key.startswith('traefik.tcp.routers.'):
+                    match = HOST_SNI_RULE_RE.search(value)
+                else:
+                    continue
+
+                if match:
+                    fqdn = match.group(1)
+                    if fqdn.endswith(ZONE_SUFFIX):
+                        add(fqdn[:-len(ZONE_SUFFIX)])
 
         return hostnames
     except Exception as e:
         logger.error(f"Error extracting hostnames: {e}")
         return []
 
+# Provision DNS, certificates and catalog entries for a service
+def provision_hostname(ipa_client: FreeIPAClient, service_name: str, hostname: str):
+    """Register one hostname of a service in FreeIPA and the catalog"""
+    ipa_client.add_dns_record(hostname, config['swarm']['traefik_ips'])
+    has_cert = False
+    if ipa_client.cert_enabled:
+        has_cert = ipa_client.request_certificate(hostname)
+
+    web_catalog.update_service_registry(hostname, service_name, config['freeipa']['dns_zone'], True, has_cert)
+
+def provision_service(ipa_client: FreeIPAClient, service_name: str, hostnames: List[str]):
+    """Register every hostname of a service in FreeIPA and the catalog"""
+    for hostname in hostnames:
+        provision_hostname(ipa_client, service_name, hostname)
+
+def cleanup_service(ipa_client: FreeIPAClient, hostnames: List[str]):
+    """Remove DNS, certificates and catalog entries for a service"""
+    for hostname in hostnames:
+        ipa_client.remove_dns_record(hostname, config['swarm']['traefik_ips'])
+        ipa_client.revoke_certificate(hostname)
+        web_catalog.remove_from_registry(hostname)
+
+def is_service_current(ipa_client: FreeIPAClient, hostnames: List[str], dns_records: set) -> bool:
+    """Check if DNS and certificates of a previously synced service are still in place"""
+    for hostname in hostnames:
+        if hostname not in dns_records:
+            return False
+        if ipa_client.cert_enabled:
+            if hostname not in ipa_client.active_certs:
+                return False
+            if not ipa_client.is_certificate_valid(ipa_client.active_certs[hostname][0]):
+                return False
+    return True
+
+class ServiceUpdateQueue:
+    """Coalesce bursts of service events and apply them from a worker thread"""
+
+    def __init__(self, ipa_client: FreeIPAClient, window: float = 1.0, state_file: Optional[str] = None):
+        self.ipa_client = ipa_client
+        self.window = window
+        self.state_file = state_file
+        # Track managed services (service_id -> List[hostname])
+        self.managed_services: Dict[str, List[str]] = {}
+        # Latest state per service: (service_name, hostnames), or None for removal
+        self.pending: Dict[str, Optional[Tuple[str, List[str]]]] = {}
+        self.last_seen: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, service_id: str, service_name: str, hostnames: List[str]):
+        """Queue a create/update, replacing any pending event for the service"""
+        with self.lock:
+            self.pending[service_id] = (service_name, hostnames)
+            self.last_seen[service_id] = time.time()
+
+    def submit_removal(self, service_id: str):
+        """Queue a removal, replacing any pending event for the service"""
+        with self.lock:
+            self.pending[service_id] = None
+            self.last_seen[service_id] = time.time()
+
+    def load_state(self) -> Dict[str, List[str]]:
+        """Load the managed services persisted by a previous run"""
+        if not self.state_file:
+            return {}
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f).get('managed_services', {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable state file: {e}")
+            return {}
+
+    def save_state(self):
+        """Persist managed services so a restart can skip unchanged ones"""
+        if not self.state_file:
+            return
+        try:
+            write_file_atomic(self.state_file, json.dumps({'managed_services': self.managed_services}), 0o600)
+        except Exception as e:
+            logger.warning(f"Could not save state: {e}")
+
+    def start(self):
+        """Start the worker thread"""
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.window)
+            self.flush()
+
+    def flush(self):
+        """Apply pending events that have been quiet for the whole window"""
+        now = time.time()
+        with self.lock:
+            due = [sid for sid, seen in self.last_seen.items() if now - seen >= self.window]
+            batch = [(sid, self.pending.pop(sid)) for sid in due]
+            for sid in due:
+                del self.last_seen[sid]
+
+        if not batch:
+            return
+
+        for service_id, update in batch:
+            try:
+                if update is None:
+                    hostnames = self.managed_services.pop(service_id, None)
+                    if hostnames:
+                        logger.info(f"Service removed: {service_id[:12]}, cleaning up {hostnames}")
+                        cleanup_service(self.ipa_client, hostnames)
+                else:
+                    service_name, hostnames = update
+                    logger.info(f"Processing service {service_name}: {hostnames}")
+                    provision_service(self.ipa_client, service_name, hostnames)
+                    self.managed_services[service_id] = hostnames
+            except Exception as e:
+                logger.error(f"Error processing service {service_id[:12]}: {e}", exc_info=True)
+
+        self.save_state()
+        self.ipa_client.save_validity_cache()
+
+# Service event actions we act on
+HANDLED_ACTIONS = ('create', 'update', 'remove')
+
+def ingest_events(docker_client, event_queue: queue.Queue):
+    """Read the Docker event stream into a queue so the socket is always drained"""
+    try:
+        # Raw newline-delimited JSON, decoded with orjson when available
+        buffer = b''
+        stream = docker_client.events(decode=False, filters={'type': 'service', 'event': list(HANDLED_ACTIONS)})
+        for chunk in stream:
+            buffer += chunk
+            *lines, buffer = buffer.split(b'\n')
+            for line in lines:
+                if not line.strip():
+                    continue
+                event = json_loads(line)
+                if event.get('Action') in HANDLED_ACTIONS:
+                    event_queue.put(event)
+    except Exception as e:
+        logger.error(f"Docker event stream failed: {e}", exc_info=True)
+    finally:
+        # Tell the main loop the stream has ended
+        event_queue.put(None)
+
+# Update states written by the swarm orchestrator while it rolls out a spec
+# that was already reported; rollback_started is absent because a rollback
+# swaps the spec back in the same write
+ROLLOUT_PROGRESS_STATES = {'updating', 'paused', 'completed', 'rollback_paused', 'rollback_completed'}
+
+def is_rollout_progress(event) -> bool:
+    """Check if a service update event only reports rollout progress"""
+    attributes = event.get('Actor', {}).get('Attributes', {})
+    return attributes.get('updatestate.new') in ROLLOUT_PROGRESS_STATES
+
 # Main monitoring loop
 def main():
     logger.info("Starting DNS and Certificate Automation Service")
@@ -400,62 +797,106 @@ def main():
     docker_client = docker.DockerClient(base_url='unix://var/run/docker.sock')
     ipa_client = FreeIPAClient(
         server=config['freeipa']['server'],
-        domain=config['freeipa']['domain'],
         username=config['freeipa']['username'],
         password=config['freeipa']['password']
     )
     
     # Initial authentication
-    if not ipa_client.kinit():
+    if not ipa_client.login():
         logger.error("Failed initial FreeIPA authentication. Exiting.")
         sys.exit(1)
+    ipa_client.start_session_refresh(config['freeipa'].get('session_refresh_interval', 600))
     
     # Create certificate directory if needed
     if ipa_client.cert_enabled:
         os.makedirs(ipa_client.cert_path, exist_ok=True)
     
-    # Track managed services (service_id -> List[hostname])
-    managed_services = {}
+    # Default next to the certificates, which already sit on a persistent
+    # volume, so the state survives task restarts
+    state_file = config['swarm'].get('state_file', os.path.join(ipa_client.cert_path, '.state.json'))
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    
+    updates = ServiceUpdateQueue(
+        ipa_client,
+        window=config['swarm'].get('event_debounce_seconds', 1.0),
+        state_file=state_file
+    )
+    previous_state = updates.load_state()
+    # Record names are only needed to confirm services from the previous run
+    dns_records = (ipa_client.list_dns_records() if previous_state else None) or set()
+    
+    # Subscribe before the startup sync so changes made during it are not missed
+    event_queue = queue.Queue(maxsize=config['swarm'].get('event_queue_size', 1024))
+    threading.Thread(target=ingest_events, args=(docker_client, event_queue), daemon=True).start()
+    
+    # Labels of every service seen so far (service_id -> labels), so rollout
+    # progress events don't need another services.get round-trip
+    service_labels = {}
     
-    # Sync existing services on startup
+    # Sync existing services on startup, one task per hostname
     logger.info("Syncing existing services...")
+    executor = ThreadPoolExecutor(max_workers=config['swarm'].get('startup_parallelism', 16))
+    sync_tasks = []
     try:
-        services = docker_client.services.list()
+        # Let the daemon filter on the required label
+        services = docker_client.services.list(filters={'label': f"{config['swarm']['required_label']}=true"})
         for service in services:
             spec = service.attrs.get('Spec', {})
-            labels = spec.get('Labels', {})
+            service_labels[service.id] = spec.get('Labels', {})
 
-            if labels.get(config['swarm']['required_label']) == 'true':
-                hostnames = extract_hostnames(service)
-                if hostnames:
+            hostnames = extract_hostnames(service)
+            if hostnames:
+                if previous_state.get(service.id) == hostnames and is_service_current(ipa_client, hostnames, dns_records):
+                    logger.info(f"Existing service unchanged since last run: {service.name} -> {hostnames}")
+                    for hostname in hostnames:
+                        web_catalog.update_service_registry(hostname, service.name, config['freeipa']['dns_zone'], True, ipa_client.cert_enabled)
+                else:
                     logger.info(f"Syncing existing service: {service.name} -> {hostnames}")
-
-                    # Process each hostname
                     for hostname in hostnames:
-                        ipa_client.add_dns_record(hostname, config['swarm']['traefik_ips'])
-                        has_cert = False
-                        if ipa_client.cert_enabled:
-                            has_cert = ipa_client.request_certificate(hostname)
-
-                        web_catalog.update_service_registry(hostname, service.name, config['freeipa']['dns_zone'], True, has_cert)
-
-                    managed_services[service.id] = hostnames
+                        sync_tasks.append(executor.submit(provision_hostname, ipa_client, service.name, hostname))
+                updates.managed_services[service.id] = hostnames
+        
+        # Services removed (or unlabelled) while we were not running
+        for service_id, hostnames in previous_state.items():
+            if service_id not in service_labels:
+                logger.info(f"Service removed while offline: {service_id[:12]}, cleaning up {hostnames}")
+                cleanup_service(ipa_client, hostnames)
+        listed = True
     except Exception as e:
         logger.error(f"Error during initial sync: {e}")
+        listed = False
+    
+    # Wait for the provisioning tasks off the main thread, so Docker events
+    # keep being drained into the update queue however long the sync takes;
+    # the worker starts applying them once the sync is done
+    def finish_startup_sync():
+        try:
+            for task in as_completed(sync_tasks):
+                try:
+                    task.result()
+                except Exception as e:
+                    logger.error(f"Error syncing hostname: {e}", exc_info=True)
+            
+            if listed:
+                updates.save_state()
+            ipa_client.save_validity_cache()
+            logger.info("Initial sync complete")
+        finally:
+            executor.shutdown(wait=True)
+            updates.start()
+    
+    threading.Thread(target=finish_startup_sync, daemon=True).start()
     
     logger.info("Starting event monitoring...")
     
     # Monitor events
-    last_kinit = time.time()
-    kinit_interval = 3600
-    
-    for event in docker_client.events(decode=True, filters={'type': 'service'}):
+    while True:
+        event = event_queue.get()
+        if event is None:
+            logger.warning("Docker event stream ended")
+            break
+        
         try:
-            # Periodic re-authentication
-            if time.time() - last_kinit > kinit_interval:
-                ipa_client.kinit()
-                last_kinit = time.time()
-            
             action = event.get('Action')
             service_id = event.get('Actor', {}).get('ID')
             
@@ -466,17 +907,13 @@ def main():
             
             # Handle removal
             if action == 'remove':
-                if service_id in managed_services:
-                    hostnames = managed_services[service_id]
-                    logger.info(f"Service removed: {service_id[:12]}, cleaning up {hostnames}")
-
-                    # Clean up each hostname
-                    for hostname in hostnames:
-                        ipa_client.remove_dns_record(hostname, config['swarm']['traefik_ips'])
-                        ipa_client.revoke_certificate(hostname)
-                        web_catalog.remove_from_registry(hostname)
-
-                    del managed_services[service_id]
+                updates.submit_removal(service_id)
+                service_labels.pop(service_id, None)
+                continue
+            
+            # Rollout progress of a known service cannot have changed its labels
+            if action == 'update' and service_id in service_labels and is_rollout_progress(event):
+                logger.debug(f"Skipping rollout progress event for {service_id[:12]}")
                 continue
             
             # For create/update
@@ -488,6 +925,7 @@ def main():
             service_name = service.name
             spec = service.attrs.get('Spec', {})
             labels = spec.get('Labels', {})
+            service_labels[service_id] = labels
 
             if not labels.get(config['swarm']['required_label']) == 'true':
                 continue
@@ -496,21 +934,8 @@ def main():
             if not hostnames:
                 continue
 
-            traefik_ips = config['swarm']['traefik_ips']
-
             if action in ['create', 'update']:
-                logger.info(f"Processing service {service_name}: {hostnames}")
-
-                # Process each hostname
-                for hostname in hostnames:
-                    ipa_client.add_dns_record(hostname, traefik_ips)
-                    has_cert = False
-                    if ipa_client.cert_enabled:
-                        has_cert = ipa_client.request_certificate(hostname)
-
-                    web_catalog.update_service_registry(hostname, service_name, config['freeipa']['dns_zone'], True, has_cert)
-
-                managed_services[service_id] = hostnames
+                updates.submit(service_id, service_name, hostnames)
                 
         except Exception as e:
             logger.error(f"Error processing event: {e}", exc_info=True)
@@ -4,96 +4,199 @@ Web-based Service Catalog for DNS Automation
 Displays auto-discovered and manual services
 """
 
+import bisect
+import gzip
 import json
 import logging
+import re
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from threading import Thread
+from email.utils import formatdate, parsedate_to_datetime
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from jinja2 import Environment
+from threading import Lock, Thread
+from typing import Optional
+
+# Prefer orjson for the JSON API
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Brotli is optional; gzip is always offered
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Compressed codings the catalog page is cached in, best first
+PAGE_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
 
 logger = logging.getLogger(__name__)
 
 # Service registry - shared with main script
 service_registry = {}
 
-# HTML Template
+# Underscores and dashes in service names become spaces in display names
+NAME_SEPARATORS = str.maketrans('_-', '  ')
+
+# Service name keywords used to pick a category
+INFRASTRUCTURE_RE = re.compile(r'traefik|portainer|prometheus|grafana|dns|catalog')
+MONITORING_RE = re.compile(r'monitor|cadvisor|node-exporter|alertmanager')
+
+# Services grouped by category, each list kept sorted by name, plus running
+# totals; maintained on mutation (under _registry_lock) so rendering never
+# has to sort or count
+_by_category = {}
+_auto_count = 0
+_cert_count = 0
+_registry_lock = Lock()
+
+@dataclass(slots=True)
+class Service:
+    """A catalog entry"""
+    id: str
+    name: str
+    url: str
+    description: str
+    category: str
+    auto_discovered: bool
+    has_certificate: bool
+    last_updated: float
+    service_name: str = ''
+    hostname: str = ''
+    # Pre-escaped copies of the displayed fields, computed once per
+    # mutation so rendering does no escaping; kept out of the JSON API
+    name_html: str = field(init=False, repr=False)
+    url_html: str = field(init=False, repr=False)
+    desc_html: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.name_html = escape(self.name)
+        self.url_html = escape(self.url, quote=True)
+        self.desc_html = escape(self.description)
+
+    def as_dict(self) -> dict:
+        """Return the JSON API representation"""
+        return {
+            'id': self.id,
+            'service_name': self.service_name,
+            'name': self.name,
+            'hostname': self.hostname,
+            'url': self.url,
+            'description': self.description,
+            'category': self.category,
+            'auto_discovered': self.auto_discovered,
+            'has_certificate': self.has_certificate,
+            'last_updated': self.last_updated
+        }
+
+@dataclass(frozen=True, slots=True)
+class RegistrySnapshot:
+    """Immutable view of the registry, replaced as a whole on every mutation"""
+    version: int
+    mtime: float
+    categories: tuple
+    services: tuple
+    auto_count: int
+    cert_count: int
+
+# Current snapshot; request threads read it without locking. The version
+# is bumped on every mutation and keys the rendered page cache and ETag
+_snapshot = RegistrySnapshot(0, time.time(), (), (), 0, 0)
+# Distinguishes ETags across restarts, when the version starts over
+_instance_id = f"{int(time.time()):x}"
+# (version, value) pairs, swapped as a whole so concurrent request
+# threads never see a page from one version paired with another
+# Rendered page per content coding ('identity', 'gzip', 'br')
+_cached_html = (-1, {})
+_cached_services = (-1, [])
+# Encoded API body per pretty flag, as (version, timestamp, body)
+_cached_json = {}
+# (time, formatted) for the API timestamp, refreshed at most once a second
+_last_timestamp = (0.0, '')
+
+# HTML Template (Jinja2)
 HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>{{ title }}</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        body {{
+        }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
-        }}
-        header {{
+        }
+        header {
             text-align: center;
             color: white;
             margin-bottom: 40px;
-        }}
-        h1 {{
+        }
+        h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
-        }}
-        .subtitle {{
+        }
+        .subtitle {
             font-size: 1.1em;
             opacity: 0.9;
-        }}
-        .stats {{
+        }
+        .stats {
             display: flex;
             gap: 20px;
             justify-content: center;
             margin-bottom: 40px;
             flex-wrap: wrap;
-        }}
-        .stat-card {{
+        }
+        .stat-card {
             background: rgba(255, 255, 255, 0.95);
             padding: 20px 30px;
             border-radius: 10px;
             box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }}
-        .stat-number {{
+        }
+        .stat-number {
             font-size: 2em;
             font-weight: bold;
             color: #667eea;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             color: #666;
             margin-top: 5px;
-        }}
-        .category {{
+        }
+        .category {
             margin-bottom: 30px;
-        }}
-        .category-header {{
+        }
+        .category-header {
             background: rgba(255, 255, 255, 0.95);
             padding: 15px 20px;
             border-radius: 10px 10px 0 0;
             font-size: 1.3em;
             font-weight: bold;
             color: #333;
-        }}
-        .services {{
+        }
+        .services {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
             gap: 15px;
             padding: 15px;
             background: rgba(255, 255, 255, 0.9);
             border-radius: 0 0 10px 10px;
-        }}
-        .service-card {{
+        }
+        .service-card {
             background: white;
             padding: 20px;
             border-radius: 8px;
@@ -102,94 +205,117 @@ HTML_TEMPLATE = """
             text-decoration: none;
             color: inherit;
             display: block;
-        }}
-        .service-card:hover {{
+        }
+        .service-card:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-        }}
-        .service-name {{
+        }
+        .service-name {
             font-size: 1.2em;
             font-weight: bold;
             color: #667eea;
             margin-bottom: 8px;
-        }}
-        .service-url {{
+        }
+        .service-url {
             color: #666;
             font-size: 0.9em;
             margin-bottom: 8px;
             word-break: break-all;
-        }}
-        .service-description {{
+        }
+        .service-description {
             color: #888;
             font-size: 0.9em;
             line-height: 1.4;
-        }}
-        .badge {{
+        }
+        .badge {
             display: inline-block;
             padding: 4px 10px;
             border-radius: 12px;
             font-size: 0.75em;
             font-weight: bold;
             margin-top: 10px;
-        }}
-        .badge-auto {{
+        }
+        .badge-auto {
             background: #e3f2fd;
             color: #1976d2;
-        }}
-        .badge-manual {{
+        }
+        .badge-manual {
             background: #f3e5f5;
             color: #7b1fa2;
-        }}
-        .badge-cert {{
+        }
+        .badge-cert {
             background: #e8f5e9;
             color: #388e3c;
             margin-left: 5px;
-        }}
-        footer {{
+        }
+        footer {
             text-align: center;
             color: rgba(255, 255, 255, 0.8);
             margin-top: 40px;
             padding: 20px;
-        }}
-        .refresh-info {{
+        }
+        .refresh-info {
             background: rgba(255, 255, 255, 0.1);
             padding: 10px;
             border-radius: 5px;
             margin-top: 10px;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <header>
-            <h1>🚀 {title}</h1>
-            <p class="subtitle">{description}</p>
+            <h1>🚀 {{ title }}</h1>
+            <p class="subtitle">{{ description }}</p>
         </header>
         
         <div class="stats">
             <div class="stat-card">
-                <div class="stat-number">{total_services}</div>
+                <div class="stat-number">{{ total_services }}</div>
                 <div class="stat-label">Total Services</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{auto_services}</div>
+                <div class="stat-number">{{ auto_services }}</div>
                 <div class="stat-label">Auto-discovered</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{manual_services}</div>
+                <div class="stat-number">{{ manual_services }}</div>
                 <div class="stat-label">Manual</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{cert_services}</div>
+                <div class="stat-number">{{ cert_services }}</div>
                 <div class="stat-label">With Certificates</div>
             </div>
         </div>
         
-        {categories_html}
+        {% for category in categories %}
+        <div class="category">
+            <div class="category-header">{{ category.name }}</div>
+            <div class="services">
+                {% for service in category.services %}
+                <a href="{{ service.url_html | safe }}" class="service-card" target="_blank">
+                    <div class="service-name">{{ service.name_html | safe }}</div>
+                    <div class="service-url">{{ service.url_html | safe }}</div>
+                    <div class="service-description">{{ service.desc_html | safe }}</div>
+                    <div>
+                        {% if service.auto_discovered %}
+                        <span class="badge badge-auto">Auto</span>
+                        {% else %}
+                        <span class="badge badge-manual">Manual</span>
+                        {% endif %}
+                        {% if service.has_certificate %}
+                        <span class="badge badge-cert">🔒 SSL</span>
+                        {% endif %}
+                    </div>
+                </a>
+                {% endfor %}
+            </div>
+        </div>
+        {% endfor %}
         
         <footer>
             <div class="refresh-info">
-                Last updated: {last_updated}<br>
+                Last updated: {{ last_updated }}<br>
                 Auto-refresh: Services are discovered in real-time
             </div>
             <p style="margin-top: 20px;">
@@ -201,20 +327,30 @@ HTML_TEMPLATE = """
 </html>
 """
 
+# Compiled once at import; autoescape covers every service-provided field
+TEMPLATE_ENV = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+PAGE_TEMPLATE = TEMPLATE_ENV.from_string(HTML_TEMPLATE)
+
 class ServiceCatalogHandler(BaseHTTPRequestHandler):
     """HTTP request handler for service catalog"""
     
+    # Keep-alive, so pollers reuse one connection; every response carries a
+    # Content-Length. Idle connections are dropped after the timeout
+    protocol_version = 'HTTP/1.1'
+    timeout = 30
+    
     def log_message(self, format, *args):
         """Override to use our logger"""
         logger.debug(f"Web request: {format % args}")
     
     def do_GET(self):
         """Handle GET requests"""
-        if self.path == '/' or self.path == '/index.html':
+        path, _, query = self.path.partition('?')
+        if path == '/' or path == '/index.html':
             self.send_catalog()
-        elif self.path == '/api/services':
-            self.send_json_api()
-        elif self.path == '/health':
+        elif path == '/api/services':
+            self.send_json_api(pretty='pretty=1' in query.split('&'))
+        elif path == '/health':
             self.send_health()
         else:
             self.send_error(404, "Not Found")
@@ -222,101 +358,254 @@ class ServiceCatalogHandler(BaseHTTPRequestHandler):
     def send_catalog(self):
         """Send HTML catalog page"""
         try:
-            # Organize services by category
-            categories = {}
-            auto_count = 0
-            cert_count = 0
-            
-            for service_id, service in service_registry.items():
-                category = service.get('category', 'Uncategorized')
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append(service)
-                
-                if service.get('auto_discovered'):
-                    auto_count += 1
-                if service.get('has_certificate'):
-                    cert_count += 1
+            snapshot = _snapshot
+            encoding = choose_encoding(self.headers.get('Accept-Encoding', ''))
+            # Strong ETags must differ per content coding
+            suffix = '' if encoding == 'identity' else f'-{encoding}'
+            etag = f'"{_instance_id}-{snapshot.version}{suffix}"'
+            if self.send_not_modified(etag, snapshot.mtime, vary='Accept-Encoding'):
+                return
             
-            # Generate category HTML
-            categories_html = ""
-            for category in sorted(categories.keys()):
-                services = sorted(categories[category], key=lambda x: x['name'])
-                
-                categories_html += f'<div class="category">'
-                categories_html += f'<div class="category-header">{category}</div>'
-                categories_html += f'<div class="services">'
-                
-                for service in services:
-                    badge_type = "badge-auto" if service.get('auto_discovered') else "badge-manual"
-                    badge_text = "Auto" if service.get('auto_discovered') else "Manual"
-                    cert_badge = '<span class="badge badge-cert">🔒 SSL</span>' if service.get('has_certificate') else ''
-                    
-                    categories_html += f'''
-                    <a href="{service['url']}" class="service-card" target="_blank">
-                        <div class="service-name">{service['name']}</div>
-                        <div class="service-url">{service['url']}</div>
-                        <div class="service-description">{service.get('description', '')}</div>
-                        <div>
-                            <span class="badge {badge_type}">{badge_text}</span>
-                            {cert_badge}
-                        </div>
-                    </a>
-                    '''
-                
-                categories_html += '</div></div>'
-            
-            # Get config from parent module
-            from __main__ import config
-            
-            # Fill template
-            html = HTML_TEMPLATE.format(
-                title=config.get('web', {}).get('title', 'Service Catalog'),
-                description=config.get('web', {}).get('description', ''),
-                total_services=len(service_registry),
-                auto_services=auto_count,
-                manual_services=len(service_registry) - auto_count,
-                cert_services=cert_count,
-                categories_html=categories_html,
-                last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            )
+            body = get_catalog_html(snapshot)[encoding]
             
             self.send_response(200)
             self.send_header('Content-Type', 'text/html; charset=utf-8')
+            if encoding != 'identity':
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(len(body)))
             self.send_header('Cache-Control', 'no-cache')
+            self.send_validators(etag, snapshot.mtime, vary='Accept-Encoding')
             self.end_headers()
-            self.wfile.write(html.encode('utf-8'))
+            self.wfile.write(body)
             
         except Exception as e:
             logger.error(f"Error generating catalog: {e}", exc_info=True)
             self.send_error(500, str(e))
     
-    def send_json_api(self):
+    def send_json_api(self, pretty: bool = False):
         """Send JSON API response"""
         try:
-            data = {
-                'services': list(service_registry.values()),
-                'total': len(service_registry),
-                'timestamp': datetime.now().isoformat()
-            }
+            snapshot = _snapshot
+            # Weak: the body's timestamp moves on while the services are unchanged
+            etag = f'W/"{_instance_id}-{snapshot.version}-json{"-pretty" if pretty else ""}"'
+            if self.send_not_modified(etag, snapshot.mtime):
+                return
+            
+            body = get_services_json(snapshot, pretty)
             
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
             self.send_header('Cache-Control', 'no-cache')
+            self.send_validators(etag, snapshot.mtime)
             self.end_headers()
-            self.wfile.write(json.dumps(data, indent=2).encode('utf-8'))
+            self.wfile.write(body)
             
         except Exception as e:
             logger.error(f"Error generating JSON: {e}", exc_info=True)
             self.send_error(500, str(e))
     
+    def send_validators(self, etag: str, mtime: float, vary: Optional[str] = None):
+        """Send the ETag, Last-Modified and (if any) Vary headers for a registry version"""
+        if vary:
+            self.send_header('Vary', vary)
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', formatdate(mtime, usegmt=True))
+    
+    def send_not_modified(self, etag: str, mtime: float, vary: Optional[str] = None) -> bool:
+        """Answer 304 if the client's copy is current; returns True when sent"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since
+            # Weak comparison, as RFC 9110 specifies for If-None-Match
+            opaque = etag.removeprefix('W/')
+            fresh = any(
+                tag == '*' or tag.removeprefix('W/') == opaque
+                for tag in (tag.strip() for tag in if_none_match.split(','))
+            )
+        else:
+            fresh = False
+            if_modified_since = self.headers.get('If-Modified-Since')
+            if if_modified_since:
+                try:
+                    fresh = int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+                except (TypeError, ValueError):
+                    pass
+        if not fresh:
+            return False
+        
+        self.send_response(304)
+        self.send_validators(etag, mtime, vary)
+        self.end_headers()
+        return True
+    
     def send_health(self):
         """Send health check response"""
         self.send_response(200)
         self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', '2')
         self.end_headers()
         self.wfile.write(b'OK')
 
+class CatalogHTTPServer(ThreadingHTTPServer):
+    """Threaded catalog server with a listen backlog sized for bursts of pollers"""
+    request_queue_size = 128
+
+def _service_sort_key(service):
+    return service.name
+
+def _index_add(service):
+    """Add a service to the category index and totals"""
+    global _auto_count, _cert_count
+    bisect.insort(_by_category.setdefault(service.category, []), service, key=_service_sort_key)
+    _auto_count += bool(service.auto_discovered)
+    _cert_count += bool(service.has_certificate)
+
+def _index_remove(service):
+    """Remove a service from the category index and totals"""
+    global _auto_count, _cert_count
+    services = _by_category[service.category]
+    i = bisect.bisect_left(services, service.name, key=_service_sort_key)
+    while services[i] is not service:
+        i += 1
+    del services[i]
+    if not services:
+        del _by_category[service.category]
+    _auto_count -= bool(service.auto_discovered)
+    _cert_count -= bool(service.has_certificate)
+
+def _store_service(service_id, service):
+    """Insert or replace a registry entry, keeping the index in step (caller holds the lock)"""
+    old = service_registry.get(service_id)
+    if old is not None:
+        _index_remove(old)
+    service_registry[service_id] = service
+    _index_add(service)
+
+def _store_services(services):
+    """Insert or replace many registry entries, rebuilding the index once (caller holds the lock)"""
+    global _auto_count, _cert_count
+    for service in services:
+        service_registry[service.id] = service
+    
+    _by_category.clear()
+    for service in service_registry.values():
+        _by_category.setdefault(service.category, []).append(service)
+    for category_services in _by_category.values():
+        category_services.sort(key=_service_sort_key)
+    _auto_count = sum(bool(service.auto_discovered) for service in service_registry.values())
+    _cert_count = sum(bool(service.has_certificate) for service in service_registry.values())
+
+def render_catalog(snapshot: RegistrySnapshot) -> bytes:
+    """Render the HTML catalog page from a registry snapshot"""
+    category_list = [
+        {'name': category, 'services': services}
+        for category, services in snapshot.categories
+    ]
+    total_count = len(snapshot.services)
+    
+    # Get config from parent module
+    from __main__ import config
+    
+    # Fill template
+    html = PAGE_TEMPLATE.render(
+        title=config.get('web', {}).get('title', 'Service Catalog'),
+        description=config.get('web', {}).get('description', ''),
+        total_services=total_count,
+        auto_services=snapshot.auto_count,
+        manual_services=total_count - snapshot.auto_count,
+        cert_services=snapshot.cert_count,
+        categories=category_list,
+        last_updated=datetime.fromtimestamp(snapshot.mtime).strftime('%Y-%m-%d %H:%M:%S')
+    )
+    return html.encode('utf-8')
+
+def get_catalog_html(snapshot: RegistrySnapshot) -> dict:
+    """Return the rendered catalog page per content coding, re-rendering only after registry changes"""
+    global _cached_html
+    cached_version, pages = _cached_html
+    if cached_version != snapshot.version:
+        html = render_catalog(snapshot)
+        pages = {'identity': html, 'gzip': gzip.compress(html, compresslevel=6)}
+        if brotli is not None:
+            pages['br'] = brotli.compress(html, quality=4)
+        _cached_html = (snapshot.version, pages)
+    return pages
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Pick the smallest cached coding the client accepts"""
+    accepted = set()
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        # An explicit q=0 means "not acceptable"
+        _, _, quality = params.replace(' ', '').partition('q=')
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            pass
+        accepted.add(coding.strip().lower())
+    for coding in PAGE_ENCODINGS:
+        if coding in accepted or '*' in accepted:
+            return coding
+    return 'identity'
+
+def get_service_list(snapshot: RegistrySnapshot) -> list:
+    """Return the registry entries as API dicts, rebuilt only after registry changes"""
+    global _cached_services
+    cached_version, services = _cached_services
+    if cached_version != snapshot.version:
+        services = [service.as_dict() for service in snapshot.services]
+        _cached_services = (snapshot.version, services)
+    return services
+
+def get_services_json(snapshot: RegistrySnapshot, pretty: bool = False) -> bytes:
+    """Return the encoded API body, re-encoding only when the registry or the timestamp changes"""
+    timestamp = _now_iso()
+    cached = _cached_json.get(pretty)
+    if cached is not None and cached[0] == snapshot.version and cached[1] == timestamp:
+        return cached[2]
+    
+    services = get_service_list(snapshot)
+    body = dump_json({
+        'services': services,
+        'total': len(services),
+        'timestamp': timestamp
+    }, pretty)
+    _cached_json[pretty] = (snapshot.version, timestamp, body)
+    return body
+
+def _now_iso() -> str:
+    """Return the current local time in ISO format, at one-second resolution"""
+    global _last_timestamp
+    t = time.time()
+    cached_time, formatted = _last_timestamp
+    if t - cached_time >= 1.0:
+        formatted = datetime.fromtimestamp(t).isoformat()
+        _last_timestamp = (t, formatted)
+    return formatted
+
+def dump_json(data, pretty: bool = False) -> bytes:
+    """Serialize to JSON bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(data, indent=2 if pretty else None).encode('utf-8')
+
+def _registry_changed():
+    """Publish a new snapshot after a registry mutation (caller holds the lock)"""
+    global _snapshot
+    _snapshot = RegistrySnapshot(
+        version=_snapshot.version + 1,
+        mtime=time.time(),
+        categories=tuple(
+            (category, tuple(_by_category[category]))
+            for category in sorted(_by_category)
+        ),
+        services=tuple(service_registry.values()),
+        auto_count=_auto_count,
+        cert_count=_cert_count
+    )
+
 def start_web_server(config):
     """Start web server in separate thread"""
     if not config.get('web', {}).get('enabled', False):
@@ -326,7 +615,9 @@ def start_web_server(config):
     port = config.get('web', {}).get('port', 8080)
     
     try:
-        server = HTTPServer(('0.0.0.0', port), ServiceCatalogHandler)
+        # One thread per request so a slow client or a re-render does not
+        # hold up everyone else; cached pages are shared read-only
+        server = CatalogHTTPServer(('0.0.0.0', port), ServiceCatalogHandler)
         logger.info(f"Starting web server on port {port}")
         
         thread = Thread(target=server.serve_forever, daemon=True)
@@ -344,50 +635,61 @@ def update_service_registry(hostname: str, service_name: str, dns_zone: str,
     url = f"https://{hostname}.{dns_zone}"
 
     # Determine category from service name
+    name_lc = service_name.lower()
     category = "Applications"
-    if any(x in service_name.lower() for x in ['traefik', 'portainer', 'prometheus', 'grafana', 'dns', 'catalog']):
+    if INFRASTRUCTURE_RE.search(name_lc):
         category = "Infrastructure"
-    elif any(x in service_name.lower() for x in ['monitor', 'cadvisor', 'node-exporter', 'alertmanager']):
+    elif MONITORING_RE.search(name_lc):
         category = "Monitoring"
 
     # Use hostname as key to allow multiple entries per service
-    service_registry[hostname] = {
-        'id': hostname,
-        'service_name': service_name,
-        'name': service_name.replace('_', ' ').replace('-', ' ').title(),
-        'hostname': hostname,
-        'url': url,
-        'description': description,
-        'category': category,
-        'auto_discovered': auto_discovered,
-        'has_certificate': has_certificate,
-        'last_updated': datetime.now().isoformat()
-    }
+    service = Service(
+        id=hostname,
+        service_name=service_name,
+        name=service_name.translate(NAME_SEPARATORS).title(),
+        hostname=hostname,
+        url=url,
+        description=description,
+        category=category,
+        auto_discovered=auto_discovered,
+        has_certificate=has_certificate,
+        last_updated=time.time()
+    )
 
+    with _registry_lock:
+        _store_service(hostname, service)
+        _registry_changed()
     logger.debug(f"Registry updated: {hostname} -> {url}")
 
 def remove_from_registry(hostname: str):
     """Remove service from registry by hostname"""
-    if hostname in service_registry:
-        del service_registry[hostname]
-        logger.debug(f"Registry removed: {hostname}")
+    with _registry_lock:
+        service = service_registry.pop(hostname, None)
+        if service is None:
+            return
+        _index_remove(service)
+        _registry_changed()
+    logger.debug(f"Registry removed: {hostname}")
 
 def load_manual_services(config):
     """Load manual services from config"""
     manual_services = config.get('manual_services', [])
     
+    entries = []
     for service in manual_services:
         service_id = service['name'].lower().replace(' ', '-')
-        service_registry[service_id] = {
-            'id': service_id,
-            'name': service['name'],
-            'hostname': '',
-            'url': service['url'],
-            'description': service.get('description', ''),
-            'category': service.get('category', 'Other'),
-            'auto_discovered': False,
-            'has_certificate': service['url'].startswith('https://'),
-            'last_updated': datetime.now().isoformat()
-        }
+        entries.append(Service(
+            id=service_id,
+            name=service['name'],
+            url=service['url'],
+            description=service.get('description', ''),
+            category=service.get('category', 'Other'),
+            auto_discovered=False,
+            has_certificate=service['url'].startswith('https://'),
+            last_updated=time.time()
+        ))
     
+    with _registry_lock:
+        _store_services(entries)
+        _registry_changed()
     logger.info(f"Loaded {len(manual_services)} manual services into catalog")